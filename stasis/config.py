@@ -6,6 +6,7 @@ Ensures all required settings are present before the app starts.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -20,6 +21,12 @@ from .models import ProviderType, get_model_config, ModelConfig
 load_dotenv()
 
 
+@lru_cache(maxsize=8)
+def _cached_model_config(model_name: str, provider: ProviderType) -> ModelConfig:
+    """Look up a model config once per (model, provider) pair."""
+    return get_model_config(model_name, provider)
+
+
 class Settings(BaseSettings):
     """Runtime configuration loaded from environment variables."""
 
@@ -47,6 +54,12 @@ class Settings(BaseSettings):
     # session history - number of exchanges to retain across restarts
     history_depth: int = Field(default=5, validation_alias='STASIS_HISTORY_DEPTH')
 
+    # in-session context - number of exchanges sent to the model each turn (0 = unlimited)
+    context_depth: int = Field(default=20, validation_alias='STASIS_CONTEXT_DEPTH')
+
+    # read memory files concurrently - helps on network/FUSE workspaces
+    parallel_reads: bool = Field(default=False, validation_alias='STASIS_PARALLEL_READS')
+
     @field_validator('workspace', mode='before')
     @classmethod
     def expand_workspace_path(cls, v: str | Path) -> Path:
@@ -89,7 +102,7 @@ class Settings(BaseSettings):
     def get_model_config(self) -> ModelConfig:
         """Get the full model configuration for the active provider."""
         model_name = self.get_active_model()
-        return get_model_config(model_name, self.provider)
+        return _cached_model_config(model_name, self.provider)
 
     def get_max_tokens(self) -> int:
         """Get max tokens, using override if set, otherwise model default."""
@@ -98,13 +111,30 @@ class Settings(BaseSettings):
         return self.get_model_config().max_tokens
 
 
-# global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the global settings instance, loading it on first use.
+
+    Credentials are validated once, when the settings are first built.
+
+    Raises:
+        ValueError: If required credentials are missing for the active provider
+    """
+    settings = Settings()
+
+    try:
+        settings.validate_credentials()
+    except ValueError as e:
+        print(f'[Stasis] Configuration error: {e}')
+        print(f'[Stasis] Please check your .env file and ensure required credentials are set')
+        raise
+
+    return settings
+
 
-# validate credentials at import time
-try:
-    settings.validate_credentials()
-except ValueError as e:
-    print(f'[Stasis] Configuration error: {e}')
-    print(f'[Stasis] Please check your .env file and ensure required credentials are set')
-    raise
+def __getattr__(name: str):
+    """Keep `from .config import settings` working without loading at import time."""
+    if name == 'settings':
+        return get_settings()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -6,15 +6,23 @@ Handles message flow, memory extraction, and provider interaction.
 
 import json
 import re
+from collections import deque
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Deque, Iterable, Optional
 
+from ..config import get_settings
 from ..providers.base import Provider, Message
 from .memory import Memory
 from .prompt import build_system_prompt, build_checkin_prompt
 from .search import MemorySearch, SearchResult
 
 
+# memory tag pattern, compiled once since it runs on every response
+# matches both <save_memory> and <save_daily> so the response is scanned once
+_TAG_RE = re.compile(r'<save_(memory|daily)>(.*?)</save_\1>', re.DOTALL)
+
+
 class Agent:
     """Main agent that orchestrates conversations with persistent memory."""
 
@@ -29,7 +37,16 @@ class Agent:
         """
         self.provider = provider
         self.memory = memory
-        self.conversation_history: List[Message] = []
+
+        # settings don't change at runtime, so resolve them once
+        settings = get_settings()
+        self._max_tokens = settings.get_max_tokens()
+
+        # bound the history sent each turn to the last N exchanges (0 = unbounded)
+        # one extra slot leaves room for the user message that opens the turn
+        depth = settings.context_depth
+        self._history_maxlen = depth * 2 + 1 if depth > 0 else None
+        self.conversation_history: Deque[Message] = self._new_history()
 
         # initialize search engine
         self.search_enabled = enable_search
@@ -50,6 +67,9 @@ class Agent:
         Returns:
             The assistant's response (with memory tags removed)
         """
+        # one timestamp for the whole turn, shared by context building and saving
+        now = datetime.now()
+
         # add user message to history
         self.conversation_history.append(Message(role='user', content=user_message))
 
@@ -64,22 +84,24 @@ class Agent:
                 print('[Stasis] No relevant memories found, loading full context')
 
         # build system prompt with search results (or full memory if no search)
-        system_prompt = build_system_prompt(self.memory, search_results=search_results)
+        system_prompt = build_system_prompt(self.memory, search_results=search_results, now=now)
 
-        # get model config for max tokens
-        from ..config import settings
-        max_tokens = settings.get_max_tokens()
+        # a capped history can start mid-exchange (e.g. after a failed turn
+        # left an unanswered user message), always send from a user message
+        messages = list(self.conversation_history)
+        if messages and messages[0].role == 'assistant':
+            messages = messages[1:]
 
         try:
             # get response from provider
             raw_response = self.provider.chat(
-                messages=self.conversation_history,
+                messages=messages,
                 system=system_prompt,
-                max_tokens=max_tokens,
+                max_tokens=self._max_tokens,
             )
 
             # extract and save memories
-            cleaned_response = self._process_memory_tags(raw_response)
+            cleaned_response = self._process_memory_tags(raw_response, now=now)
 
             # add assistant response to history (use cleaned version)
             self.conversation_history.append(
@@ -109,14 +131,11 @@ class Agent:
         # simple message to trigger check-in
         messages = [Message(role='user', content='Generate check-in message')]
 
-        from ..config import settings
-        max_tokens = settings.get_max_tokens()
-
         try:
             response = self.provider.chat(
                 messages=messages,
                 system=system_prompt,
-                max_tokens=max_tokens,
+                max_tokens=self._max_tokens,
             )
 
             # save that we did a check-in
@@ -131,13 +150,12 @@ class Agent:
 
     def clear_history(self) -> None:
         """Clear the conversation history (keeps memory intact)."""
-        self.conversation_history = []
+        self.conversation_history = self._new_history()
         print('[Stasis] Conversation history cleared')
 
     def save_session(self) -> None:
         """Save recent conversation history for next session."""
-        from ..config import settings
-        depth = settings.history_depth
+        depth = get_settings().history_depth
 
         if depth <= 0 or not self.conversation_history:
             return
@@ -147,7 +165,11 @@ class Agent:
 
         # keep last N exchanges (1 exchange = 2 messages)
         max_messages = depth * 2
-        recent = self.conversation_history[-max_messages:]
+        recent = list(self.conversation_history)[-max_messages:]
+
+        # a capped history can start mid-exchange, always resume from a user message
+        if recent and recent[0].role == 'assistant':
+            recent = recent[1:]
 
         data = [{'role': msg.role, 'content': msg.content} for msg in recent]
 
@@ -163,58 +185,70 @@ class Agent:
 
         try:
             data = json.loads(session_path.read_text(encoding='utf-8'))
-            self.conversation_history = [
+            self.conversation_history = self._new_history(
                 Message(role=msg['role'], content=msg['content'])
                 for msg in data
-            ]
+            )
             print(f'[Stasis] Loaded {len(self.conversation_history)} messages from last session')
         except (json.JSONDecodeError, KeyError) as e:
             print(f'[Stasis] Failed to load session: {e}')
 
-    def _process_memory_tags(self, response: str) -> str:
+    def _new_history(self, messages: Iterable[Message] = ()) -> Deque[Message]:
+        """Create a conversation history capped at the configured context depth."""
+        return deque(messages, maxlen=self._history_maxlen)
+
+    def _process_memory_tags(self, response: str, now: Optional[datetime] = None) -> str:
         """
         Extract and save memory tags from response.
 
         Args:
             response: Raw response from LLM
+            now: Time to stamp saved entries with (defaults to now)
 
         Returns:
             Response with memory tags removed
         """
-        cleaned = response
+        matches = {'memory': [], 'daily': []}
 
-        # extract and save <save_memory> tags
-        memory_pattern = r'<save_memory>(.*?)</save_memory>'
-        memory_matches = re.findall(memory_pattern, cleaned, re.DOTALL)
-        memory_changed = False
-        for match in memory_matches:
+        def collect(match: re.Match) -> str:
+            # record the tag's content by type and strip the tag itself
+            matches[match.group(1)].append(match.group(2))
+            return ''
+
+        # extract both tag types, removing them in the same pass
+        cleaned = _TAG_RE.sub(collect, response)
+
+        # save <save_memory> tags
+        memory_entries = []
+        for match in matches['memory']:
             content = match.strip()
             if content:
                 preview = content[:50] + '...' if len(content) > 50 else content
                 print(f'[Stasis] Extracting memory: {preview}')
-                self.memory.append_memory(content)
-                memory_changed = True
+                memory_entries.append(content)
 
-        # re-index if new memories were saved
-        if memory_changed and self.search_enabled and self.search:
-            self.search.index_memory_file()
+        # write all memories at once and re-index if any were saved
+        if memory_entries:
+            self.memory.append_memory_batch(memory_entries, now=now)
+            if self.search_enabled and self.search:
+                self.search.index_memory_file()
 
-        # extract and save <save_daily> tags
-        daily_pattern = r'<save_daily>(.*?)</save_daily>'
-        daily_matches = re.findall(daily_pattern, cleaned, re.DOTALL)
-        for match in daily_matches:
+        # save <save_daily> tags
+        daily_entries = []
+        for match in matches['daily']:
             content = match.strip()
             if content:
                 preview = content[:50] + '...' if len(content) > 50 else content
                 print(f'[Stasis] Extracting daily: {preview}')
-                self.memory.append_daily(content)
+                daily_entries.append(content)
 
-        # remove all memory tags from response
-        cleaned = re.sub(memory_pattern, '', cleaned, flags=re.DOTALL)
-        cleaned = re.sub(daily_pattern, '', cleaned, flags=re.DOTALL)
+        if daily_entries:
+            self.memory.append_daily_batch(daily_entries, date=now)
 
         # clean up any extra whitespace left behind
-        cleaned = re.sub(r'\n\n\n+', '\n\n', cleaned)
+        # (plain str ops; usually a single `in` check finds nothing to collapse)
+        while '\n\n\n' in cleaned:
+            cleaned = cleaned.replace('\n\n\n', '\n\n')
         cleaned = cleaned.strip()
 
         return cleaned
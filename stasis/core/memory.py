@@ -5,28 +5,57 @@ Manages markdown-based memory files that give Stasis long-term recall
 across conversations. All memory is human-readable and editable.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+
+
+# shared pool for overlapping memory file reads, created on first use
+_IO_POOL: Optional[ThreadPoolExecutor] = None
+
+
+def _io_pool() -> ThreadPoolExecutor:
+    """Get the shared I/O thread pool, creating it if needed."""
+    global _IO_POOL
+    if _IO_POOL is None:
+        _IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='stasis-io')
+    return _IO_POOL
 
 
 class Memory:
     """Manages reading and writing memory files in the workspace."""
 
-    def __init__(self, workspace: Path):
+    def __init__(self, workspace: Path, parallel_reads: bool = False):
         """
         Initialize memory system.
 
         Args:
             workspace: Path to workspace directory containing memory files
+            parallel_reads: Read context files concurrently (helps on slow
+                network/FUSE filesystems, usually slower on local disks)
         """
         self.workspace = workspace
         self.daily_dir = workspace / 'daily'
+        self.parallel_reads = parallel_reads
 
         # ensure directories exist
         self.workspace.mkdir(parents=True, exist_ok=True)
         self.daily_dir.mkdir(parents=True, exist_ok=True)
 
+        # resolve file paths once as plain strings for the read hot path
+        self._soul_path = str(workspace / 'SOUL.md')
+        self._user_path = str(workspace / 'USER.md')
+        self._memory_path = str(workspace / 'MEMORY.md')
+        self._daily_dir_path = str(self.daily_dir)
+
+        # last assembled context, keyed by the stat of every file it reads
+        self._context_cache: Optional[Tuple[tuple, str]] = None
+
+        # decoded file contents keyed by path, with the mtime and size they were read at
+        self._file_cache: Dict[str, Tuple[int, int, str]] = {}
+
     def get_soul(self) -> str:
         """
         Read SOUL.md - personality and behavioral guidelines.
@@ -34,7 +63,7 @@ class Memory:
         Returns:
             Content of SOUL.md, or empty string if not found
         """
-        return self._read_file('SOUL.md')
+        return self._read_path(self._soul_path)
 
     def get_user(self) -> str:
         """
@@ -43,7 +72,7 @@ class Memory:
         Returns:
             Content of USER.md, or empty string if not found
         """
-        return self._read_file('USER.md')
+        return self._read_path(self._user_path)
 
     def get_memory(self) -> str:
         """
@@ -52,7 +81,7 @@ class Memory:
         Returns:
             Content of MEMORY.md, or empty string if not found
         """
-        return self._read_file('MEMORY.md')
+        return self._read_path(self._memory_path)
 
     def get_daily(self, date: Optional[datetime] = None) -> str:
         """
@@ -67,42 +96,59 @@ class Memory:
         if date is None:
             date = datetime.now()
 
-        filename = f'{date.strftime("%Y-%m-%d")}.md'
-        return self._read_file(f'daily/{filename}')
+        return self._read_path(self._daily_path(date.strftime('%Y-%m-%d')))
 
-    def get_recent_daily(self, days: int = 2) -> str:
+    def get_recent_daily(self, days: int = 2, now: Optional[datetime] = None) -> str:
         """
         Read recent daily logs (today + N previous days).
 
         Args:
             days: Number of days to include (default 2 = today + yesterday)
+            now: Current time to count back from (defaults to now)
 
         Returns:
             Combined daily logs with date headers
         """
         logs = []
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
 
-        for i in range(days):
-            date = now - timedelta(days=i)
-            content = self.get_daily(date)
+        # walk from oldest to newest so logs are already in order
+        for i in range(days - 1, -1, -1):
+            date_str = (now - timedelta(days=i)).strftime('%Y-%m-%d')
+            content = self._read_path(self._daily_path(date_str))
             if content:
-                date_str = date.strftime('%Y-%m-%d')
                 logs.append(f'# {date_str}\n\n{content}')
 
-        # reverse so oldest is first
-        return '\n\n---\n\n'.join(reversed(logs))
+        return '\n\n---\n\n'.join(logs)
 
-    def append_memory(self, content: str) -> None:
+    def append_memory(self, content: str, now: Optional[datetime] = None) -> None:
         """
         Append content to MEMORY.md with timestamp.
 
         Args:
             content: Text to append
+            now: Time to stamp the entry with (defaults to now)
         """
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M')
-        entry = f'[{timestamp}]\n{content}'
-        self._append_file('MEMORY.md', entry)
+        self.append_memory_batch([content], now)
+
+    def append_memory_batch(self, contents: List[str], now: Optional[datetime] = None) -> None:
+        """
+        Append several entries to MEMORY.md with one file write.
+
+        Args:
+            contents: Texts to append, in order
+            now: Time to stamp the entries with (defaults to now)
+        """
+        if not contents:
+            return
+
+        if now is None:
+            now = datetime.now()
+
+        timestamp = now.strftime('%Y-%m-%d %H:%M')
+        entries = [f'[{timestamp}]\n{content}' for content in contents]
+        self._append_file(self._memory_path, entries)
         print(f'[Stasis] Memory saved to MEMORY.md')
 
     def append_daily(self, content: str, date: Optional[datetime] = None) -> None:
@@ -113,75 +159,179 @@ class Memory:
             content: Text to append
             date: Date for the log (defaults to today)
         """
+        self.append_daily_batch([content], date)
+
+    def append_daily_batch(self, contents: List[str], date: Optional[datetime] = None) -> None:
+        """
+        Append several entries to the daily log with one file write.
+
+        Args:
+            contents: Texts to append, in order
+            date: Date for the log (defaults to today)
+        """
+        if not contents:
+            return
+
         if date is None:
             date = datetime.now()
 
         timestamp = date.strftime('%H:%M')
-        entry = f'[{timestamp}]\n{content}'
+        entries = [f'[{timestamp}]\n{content}' for content in contents]
 
-        filename = f'{date.strftime("%Y-%m-%d")}.md'
-        self._append_file(f'daily/{filename}', entry)
+        date_str = date.strftime('%Y-%m-%d')
+        filename = f'{date_str}.md'
+        self._append_file(self._daily_path(date_str), entries)
         print(f'[Stasis] Daily log updated: {filename}')
 
-    def build_context(self) -> str:
+    def build_context(self, now: Optional[datetime] = None) -> str:
         """
         Build full memory context for system prompt.
 
         Combines SOUL, USER, MEMORY, and recent daily logs.
 
+        Args:
+            now: Current time used to pick the daily logs (defaults to now)
+
         Returns:
             Formatted context string
         """
-        sections = []
-
-        soul = self.get_soul()
-        if soul:
-            sections.append(f'# SOUL\n\n{soul}')
-
-        user = self.get_user()
-        if user:
-            sections.append(f'# USER\n\n{user}')
-
-        memory = self.get_memory()
-        if memory:
-            sections.append(f'# LONG-TERM MEMORY\n\n{memory}')
+        if now is None:
+            now = datetime.now()
+
+        # reuse the last context if none of its files have changed
+        key = self._context_key(now)
+        if self._context_cache is not None and self._context_cache[0] == key:
+            return self._context_cache[1]
+
+        # collect headers and bodies as separate fragments and join once at the
+        # end, so section content is only copied into the final string
+        parts = []
+
+        def add_section(header: str, body: str) -> None:
+            if not body:
+                return
+            if parts:
+                parts.append('\n\n---\n\n')
+            parts.append(header)
+            parts.append(body)
+
+        if self.parallel_reads:
+            # the files are independent, so overlap their reads on the pool
+            pool = _io_pool()
+            futures = [
+                pool.submit(self.get_soul),
+                pool.submit(self.get_user),
+                pool.submit(self.get_memory),
+                pool.submit(self.get_recent_daily, 2, now),
+            ]
+            soul, user, memory, recent = (future.result() for future in futures)
+        else:
+            soul = self.get_soul()
+            user = self.get_user()
+            memory = self.get_memory()
+            recent = self.get_recent_daily(days=2, now=now)
+
+        add_section('# SOUL\n\n', soul)
+        add_section('# USER\n\n', user)
+        add_section('# LONG-TERM MEMORY\n\n', memory)
+        add_section('# RECENT ACTIVITY\n\n', recent)
+
+        context = ''.join(parts)
+        self._context_cache = (key, context)
+        return context
+
+    def _context_paths(self, now: datetime) -> List[str]:
+        """Get the paths of every file that feeds into build_context."""
+        paths = [self._soul_path, self._user_path, self._memory_path]
+
+        # matches the two days read by get_recent_daily in build_context
+        for i in range(2):
+            date = now - timedelta(days=i)
+            paths.append(self._daily_path(date.strftime('%Y-%m-%d')))
 
-        recent = self.get_recent_daily(days=2)
-        if recent:
-            sections.append(f'# RECENT ACTIVITY\n\n{recent}')
+        return paths
 
-        return '\n\n---\n\n'.join(sections)
+    def _context_key(self, now: datetime) -> tuple:
+        """
+        Build a cache key from the mtime and size of the context files.
 
-    def _read_file(self, relative_path: str) -> str:
+        Missing files are recorded with None so creating one invalidates the key.
+        """
+        key = []
+        for path in self._context_paths(now):
+            try:
+                stat = os.stat(path)
+                key.append((path, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                key.append((path, None, None))
+        return tuple(key)
+
+    def _daily_path(self, date_str: str) -> str:
+        """Get the path of the daily log for a YYYY-MM-DD date string."""
+        return os.path.join(self._daily_dir_path, f'{date_str}.md')
+
+    def _read_path(self, path: str) -> str:
         """
         Read a file from the workspace.
 
         Args:
-            relative_path: Path relative to workspace
+            path: Full path to the file
 
         Returns:
             File content, or empty string if not found
         """
-        path = self.workspace / relative_path
-        if path.exists():
-            return path.read_text(encoding='utf-8').strip()
-        return ''
-
-    def _append_file(self, relative_path: str, content: str) -> None:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return ''
+
+        # return the cached content if the file hasn't changed since last read
+        cached = self._file_cache.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        # read raw bytes and decode directly, skipping the text wrapper
+        try:
+            with open(path, 'rb') as f:
+                content = f.read().decode('utf-8')
+        except FileNotFoundError:
+            return ''
+
+        # match text mode's universal newlines, CRLF files (e.g. written on
+        # Windows) would otherwise leave '\r' in the prompt
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        content = content.strip()
+
+        self._file_cache[path] = (stat.st_mtime_ns, stat.st_size, content)
+        return content
+
+    def _append_file(self, path: str, entries: List[str]) -> None:
         """
-        Append content to a file in the workspace.
+        Append entries to a file in the workspace in a single write.
 
-        Creates the file if it doesn't exist.
+        Creates the file (and its parent directory) if it doesn't exist.
 
         Args:
-            relative_path: Path relative to workspace
-            content: Text to append
+            path: Full path to the file
+            entries: Texts to append, each separated by newlines
         """
-        path = self.workspace / relative_path
-
-        # ensure parent directory exists
-        path.parent.mkdir(parents=True, exist_ok=True)
-
-        # append with newline separation
-        with path.open('a', encoding='utf-8') as f:
-            f.write(f'\n{content}\n')
+        # append with newline separation, encoded once up front
+        data = ''.join(f'\n{entry}\n' for entry in entries).encode('utf-8')
+
+        # unbuffered O_APPEND write, no text wrapper or flush machinery
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        try:
+            fd = os.open(path, flags, 0o644)
+        except FileNotFoundError:
+            # parent directory is missing, create it and retry
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd = os.open(path, flags, 0o644)
+
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        finally:
+            os.close(fd)
@@ -4,31 +4,19 @@ System prompt construction.
 Builds prompts that tell the LLM how to behave and use memory tags.
 """
 
+from datetime import datetime
+from functools import lru_cache
 from typing import List, Optional
 from .memory import Memory
 
 
-def build_system_prompt(memory: Memory, search_results: Optional[List] = None) -> str:
-    """
-    Build the complete system prompt with memory context.
-
-    Args:
-        memory: Memory instance to pull context from
-        search_results: Optional search results to use instead of full memory
-
-    Returns:
-        Full system prompt string
-    """
-    # build context with search results if provided
-    if search_results:
-        context = _build_search_context(memory, search_results)
-    else:
-        context = memory.build_context()
-
-    prompt = f"""You are Stasis, a personal AI assistant with persistent memory.
+# static parts of the system prompt, only the memory context varies per call
+_PROMPT_PREFIX = """You are Stasis, a personal AI assistant with persistent memory.
 
 <memory_context>
-{context}
+"""
+
+_PROMPT_SUFFIX = """
 </memory_context>
 
 <memory_instructions>
@@ -64,7 +52,51 @@ You're a personal assistant focused on helping the user stay accountable and mai
 Be genuine, not performative. Have opinions when asked. Keep responses concise unless depth is needed.
 </role>"""
 
-    return prompt
+# static parts of the check-in prompt, the prefix is filled once per check-in type
+_CHECKIN_PREFIX_TEMPLATE = """You are Stasis, reaching out for a {checkin_type} check-in.
+
+<memory_context>
+"""
+
+_CHECKIN_SUFFIX = """
+</memory_context>
+
+<task>
+Generate a brief, natural check-in message. Based on recent activity and user context:
+
+- Ask how things are going with current projects or goals
+- Reference specific things from memory if relevant
+- Keep it conversational and genuine, not robotic
+- Don't be overly formal or verbose
+- Show that you remember context from previous conversations
+
+This is a proactive message, so make it feel natural and helpful, not intrusive.
+</task>"""
+
+
+def build_system_prompt(
+    memory: Memory,
+    search_results: Optional[List] = None,
+    now: Optional[datetime] = None,
+) -> str:
+    """
+    Build the complete system prompt with memory context.
+
+    Args:
+        memory: Memory instance to pull context from
+        search_results: Optional search results to use instead of full memory
+        now: Current time used to pick the daily logs (defaults to now)
+
+    Returns:
+        Full system prompt string
+    """
+    # build context with search results if provided
+    if search_results:
+        context = _build_search_context(memory, search_results, now=now)
+        return _PROMPT_PREFIX + context + _PROMPT_SUFFIX
+
+    # full memory context is usually unchanged between turns, so reuse the prompt
+    return _full_memory_prompt(memory.build_context(now=now))
 
 
 def build_checkin_prompt(memory: Memory, checkin_type: str = 'daily') -> str:
@@ -80,34 +112,38 @@ def build_checkin_prompt(memory: Memory, checkin_type: str = 'daily') -> str:
     """
     context = memory.build_context()
 
-    prompt = f"""You are Stasis, reaching out for a {checkin_type} check-in.
+    return _checkin_prefix(checkin_type) + context + _CHECKIN_SUFFIX
 
-<memory_context>
-{context}
-</memory_context>
 
-<task>
-Generate a brief, natural check-in message. Based on recent activity and user context:
+@lru_cache(maxsize=1)
+def _full_memory_prompt(context: str) -> str:
+    """
+    Wrap the full memory context in the system prompt.
 
-- Ask how things are going with current projects or goals
-- Reference specific things from memory if relevant
-- Keep it conversational and genuine, not robotic
-- Don't be overly formal or verbose
-- Show that you remember context from previous conversations
+    Memory.build_context returns the same cached string while no memory file
+    has changed, so repeat turns hit this cache without rebuilding the prompt.
+    """
+    return _PROMPT_PREFIX + context + _PROMPT_SUFFIX
 
-This is a proactive message, so make it feel natural and helpful, not intrusive.
-</task>"""
 
-    return prompt
+@lru_cache(maxsize=8)
+def _checkin_prefix(checkin_type: str) -> str:
+    """Format the check-in prompt prefix, cached since there are only a few types."""
+    return _CHECKIN_PREFIX_TEMPLATE.format(checkin_type=checkin_type)
 
 
-def _build_search_context(memory: Memory, search_results: List) -> str:
+def _build_search_context(
+    memory: Memory,
+    search_results: List,
+    now: Optional[datetime] = None,
+) -> str:
     """
     Build context using search results instead of full memory.
 
     Args:
         memory: Memory instance
         search_results: Search results from MemorySearch
+        now: Current time used to pick the daily logs (defaults to now)
 
     Returns:
         Formatted context string
@@ -132,7 +168,7 @@ def _build_search_context(memory: Memory, search_results: List) -> str:
         sections.append(memory_section.strip())
 
     # still include recent daily logs
-    recent = memory.get_recent_daily(days=2)
+    recent = memory.get_recent_daily(days=2, now=now)
     if recent:
         sections.append(f'# RECENT ACTIVITY\n\n{recent}')
 
@@ -5,14 +5,22 @@ Combines BM25 keyword search with semantic vector search for accurate
 and flexible memory retrieval.
 """
 
+import bisect
 import hashlib
+import os
 import sqlite3
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
+
+# sentence-transformers pulls in torch and takes seconds to import, so it is
+# only imported when the embedding model is first needed
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 
 @dataclass
@@ -26,6 +34,99 @@ class SearchResult:
     source_file: str
 
 
+# embedding model, loaded once per process and shared by every MemorySearch
+_MODEL_NAME = 'all-MiniLM-L6-v2'
+_MODEL_CACHE: Dict[str, 'SentenceTransformer'] = {}
+
+
+def _configure_torch() -> None:
+    """Use intra-op threads only, so encode calls don't oversubscribe cores."""
+    import torch
+
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # can only be set before torch runs any parallel work
+
+
+def _load_model(name: str) -> 'SentenceTransformer':
+    """Load a sentence-transformers model, reusing it if already loaded."""
+    model = _MODEL_CACHE.get(name)
+    if model is None:
+        print('[Stasis] Loading embedding model...')
+        from sentence_transformers import SentenceTransformer
+
+        _configure_torch()
+        model = SentenceTransformer(name)
+
+        # half precision halves memory traffic on GPUs; CPU fp16/bf16 support
+        # varies too much by hardware, so CPU inference stays fp32
+        if model.device.type == 'cuda':
+            model.half()
+
+        _MODEL_CACHE[name] = model
+        print('[Stasis] Embedding model loaded')
+    return model
+
+
+@lru_cache(maxsize=1024)
+def _encode_query(model_name: str, query: str) -> bytes:
+    """
+    Embed a search query, caching by exact query text.
+
+    Repeated queries skip the transformer entirely. The normalized float32
+    vector is kept as bytes (1.5 KB for 384 dimensions) so it can't be mutated.
+    """
+    embedding = _load_model(model_name).encode(
+        query, convert_to_numpy=True, normalize_embeddings=True
+    )
+    return embedding.astype(np.float32).tobytes()
+
+
+def _hash_bytes(data: bytes) -> str:
+    """Hash content for change detection (BLAKE2b, 128-bit hex digest)."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _quantize(embedding: np.ndarray) -> Tuple[bytes, float]:
+    """
+    Quantize an embedding to int8 with a single per-vector scale.
+
+    Stored vectors are a quarter of the float32 size; for normalized
+    embeddings the cosine error is well under 1%.
+
+    Returns:
+        Tuple of (int8 bytes, scale) where embedding ~= int8 * scale
+    """
+    scale = float(np.abs(embedding).max()) / 127 or 1.0
+    quantized = np.round(embedding / scale).astype(np.int8)
+    return quantized.tobytes(), scale
+
+
+def _save_npy(path: Path, array: np.ndarray) -> None:
+    """Save an array as .npy, replacing any existing file atomically."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+# hashes per IN (...) query, well below SQLite's bound-parameter limit
+_SQL_BATCH_SIZE = 500
+
+
+def _placeholders(values: list) -> str:
+    """Build a comma-separated list of ? placeholders for an IN clause."""
+    return ', '.join('?' * len(values))
+
+
+def _top_indices(scores: np.ndarray, k: int) -> Iterable[int]:
+    """Get the indices of the k highest scores, in no particular order."""
+    if k >= len(scores):
+        return range(len(scores))
+    return np.argpartition(-scores, k)[:k].tolist()
+
+
 class MemorySearch:
     """Hybrid search engine using BM25 + vector embeddings."""
 
@@ -40,34 +141,60 @@ class MemorySearch:
         self.index_dir = workspace / '.stasis'
         self.db_path = self.index_dir / 'index.db'
 
+        # numpy mirror of the embeddings table, rewritten whenever chunks are added
+        self.vectors_path = self.index_dir / 'embeddings.npy'
+        self.vector_ids_path = self.index_dir / 'embedding_ids.npy'
+
         # ensure index directory exists
         self.index_dir.mkdir(parents=True, exist_ok=True)
 
-        # load embedding model (small and fast)
-        print('[Stasis] Loading embedding model...')
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        print('[Stasis] Embedding model loaded')
+        # embedding model (small and fast, shared across instances), loaded
+        # on first use so an unchanged index never imports torch
+        self._model: Optional['SentenceTransformer'] = None
+
+        # content hashes known to be in memory_embeddings (rows are never deleted)
+        self._indexed_hashes: Set[str] = set()
+
+        # one SQLite connection per thread, opened on first use and kept open
+        self._local = threading.local()
+
+        # embedding matrix and matching row ids, loaded on first search
+        self._vectors: Optional[np.ndarray] = None
+        self._vector_ids: Optional[np.ndarray] = None
 
         # initialize database
         self._init_db()
 
+    @property
+    def model(self) -> 'SentenceTransformer':
+        """Get the embedding model, loading it on first use."""
+        if self._model is None:
+            self._model = _load_model(_MODEL_NAME)
+        return self._model
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Get this thread's SQLite connection, opening and tuning it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+
+            # journal_mode=WAL persists in the db file; with WAL,
+            # synchronous=NORMAL only syncs at checkpoints and stays crash-safe
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA mmap_size=268435456')  # 256 MiB
+            conn.execute('PRAGMA cache_size=-65536')  # 64 MiB
+            conn.execute('PRAGMA temp_store=MEMORY')
+
+            self._local.conn = conn
+        return conn
+
     def _init_db(self) -> None:
         """Initialize SQLite database with FTS5 and embeddings tables."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn
         cursor = conn.cursor()
 
-        # FTS5 table for BM25 search
-        cursor.execute('''
-            CREATE VIRTUAL TABLE IF NOT EXISTS memory_fts USING fts5(
-                content,
-                source_file,
-                line_start,
-                line_end,
-                timestamp,
-                content_hash
-            )
-        ''')
-
         # embeddings table for vector search
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS memory_embeddings (
@@ -78,7 +205,8 @@ class MemorySearch:
                 source_file TEXT,
                 line_start INTEGER,
                 line_end INTEGER,
-                timestamp TEXT
+                timestamp TEXT,
+                scale REAL
             )
         ''')
 
@@ -87,12 +215,99 @@ class MemorySearch:
             CREATE TABLE IF NOT EXISTS file_metadata (
                 file_path TEXT PRIMARY KEY,
                 file_hash TEXT,
-                last_indexed TEXT
+                last_indexed TEXT,
+                file_mtime_ns INTEGER,
+                file_size INTEGER
             )
         ''')
 
+        # migrate indexes created before mtime/size were tracked
+        cursor.execute('PRAGMA table_info(file_metadata)')
+        columns = {row[1] for row in cursor.fetchall()}
+        if 'file_mtime_ns' not in columns:
+            cursor.execute('ALTER TABLE file_metadata ADD COLUMN file_mtime_ns INTEGER')
+        if 'file_size' not in columns:
+            cursor.execute('ALTER TABLE file_metadata ADD COLUMN file_size INTEGER')
+
+        # rehash chunks from indexes that used MD5 so unchanged chunks still match
+        cursor.execute('PRAGMA user_version')
+        if cursor.fetchone()[0] < 1:
+            cursor.execute('SELECT id, content FROM memory_embeddings')
+            cursor.executemany(
+                'UPDATE memory_embeddings SET content_hash = ? WHERE id = ?',
+                [(_hash_bytes(content.encode()), row_id) for row_id, content in cursor.fetchall()]
+            )
+            # stored file hashes are MD5 too, force a re-check on next index
+            cursor.execute('DELETE FROM file_metadata')
+            cursor.execute('PRAGMA user_version = 1')
+
+        # FTS5 index for BM25 search; content is read from memory_embeddings
+        # rather than stored a second time, and triggers keep the index in sync
+        cursor.execute('PRAGMA user_version')
+        if cursor.fetchone()[0] < 2:
+            # older indexes kept their own copy of every chunk, rebuild from rows
+            cursor.execute('DROP TABLE IF EXISTS memory_fts')
+            cursor.execute('''
+                CREATE VIRTUAL TABLE memory_fts USING fts5(
+                    content,
+                    source_file,
+                    line_start,
+                    line_end,
+                    timestamp,
+                    content_hash,
+                    content='memory_embeddings',
+                    content_rowid='id',
+                    tokenize='porter unicode61'
+                )
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS memory_embeddings_fts_insert
+                AFTER INSERT ON memory_embeddings BEGIN
+                    INSERT INTO memory_fts (rowid, content, source_file, line_start, line_end, timestamp, content_hash)
+                    VALUES (new.id, new.content, new.source_file, new.line_start, new.line_end, new.timestamp, new.content_hash);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS memory_embeddings_fts_delete
+                AFTER DELETE ON memory_embeddings BEGIN
+                    INSERT INTO memory_fts (memory_fts, rowid, content, source_file, line_start, line_end, timestamp, content_hash)
+                    VALUES ('delete', old.id, old.content, old.source_file, old.line_start, old.line_end, old.timestamp, old.content_hash);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS memory_embeddings_fts_update
+                AFTER UPDATE OF content, source_file, line_start, line_end, timestamp, content_hash
+                ON memory_embeddings BEGIN
+                    INSERT INTO memory_fts (memory_fts, rowid, content, source_file, line_start, line_end, timestamp, content_hash)
+                    VALUES ('delete', old.id, old.content, old.source_file, old.line_start, old.line_end, old.timestamp, old.content_hash);
+                    INSERT INTO memory_fts (rowid, content, source_file, line_start, line_end, timestamp, content_hash)
+                    VALUES (new.id, new.content, new.source_file, new.line_start, new.line_end, new.timestamp, new.content_hash);
+                END
+            ''')
+            cursor.execute("INSERT INTO memory_fts (memory_fts) VALUES ('rebuild')")
+            cursor.execute('PRAGMA user_version = 2')
+
+        # migrate float32 embeddings from older indexes to int8 + scale
+        cursor.execute('PRAGMA user_version')
+        if cursor.fetchone()[0] < 3:
+            cursor.execute('PRAGMA table_info(memory_embeddings)')
+            columns = {row[1] for row in cursor.fetchall()}
+            if 'scale' not in columns:
+                cursor.execute('ALTER TABLE memory_embeddings ADD COLUMN scale REAL')
+
+            cursor.execute('SELECT id, embedding FROM memory_embeddings WHERE scale IS NULL')
+            updates = []
+            for row_id, embedding_blob in cursor.fetchall():
+                embedding = np.frombuffer(embedding_blob, dtype=np.float32)
+                embedding = embedding / max(np.linalg.norm(embedding), 1e-12)
+                updates.append((*_quantize(embedding), row_id))
+            cursor.executemany(
+                'UPDATE memory_embeddings SET embedding = ?, scale = ? WHERE id = ?',
+                updates
+            )
+            cursor.execute('PRAGMA user_version = 3')
+
         conn.commit()
-        conn.close()
 
     def index_memory_file(self, force: bool = False) -> None:
         """
@@ -106,9 +321,17 @@ class MemorySearch:
             print('[Stasis] MEMORY.md not found, skipping indexing')
             return
 
-        # check if file changed
+        # check if file changed - a matching mtime and size skips hashing entirely
+        stat = os.stat(memory_path)
+        metadata = self._get_file_metadata(str(memory_path))
+        if not force and metadata and metadata[1:] == (stat.st_mtime_ns, stat.st_size):
+            print('[Stasis] MEMORY.md unchanged, skipping indexing')
+            return
+
         current_hash = self._hash_file(memory_path)
-        if not force and not self._file_changed(str(memory_path), current_hash):
+        if not force and metadata and metadata[0] == current_hash:
+            # touched but not modified, remember the new mtime for next time
+            self._update_file_metadata(str(memory_path), current_hash, stat)
             print('[Stasis] MEMORY.md unchanged, skipping indexing')
             return
 
@@ -119,60 +342,89 @@ class MemorySearch:
         chunks = self._chunk_content(content, str(memory_path))
 
         # index chunks
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn
         cursor = conn.cursor()
 
-        indexed_count = 0
+        # find which chunks are already indexed (by content hash); hashes seen
+        # indexed earlier in this process are trusted, the rest are checked
+        # with one query per batch, staying under SQLite's bound-parameter limit
+        indexed = self._indexed_hashes if not force else set()
+        if not force:
+            hashes = list(dict.fromkeys(
+                chunk['content_hash'] for chunk in chunks
+                if chunk['content_hash'] not in indexed
+            ))
+            for i in range(0, len(hashes), _SQL_BATCH_SIZE):
+                batch = hashes[i:i + _SQL_BATCH_SIZE]
+                cursor.execute(
+                    f'SELECT content_hash FROM memory_embeddings WHERE content_hash IN ({_placeholders(batch)})',
+                    batch
+                )
+                indexed.update(row[0] for row in cursor.fetchall())
+
+        # chunks that need embedding, skipping repeats within the file
+        to_embed = []
+        seen = set()
         for chunk in chunks:
-            # check if chunk already indexed (by content hash)
-            cursor.execute(
-                'SELECT id FROM memory_embeddings WHERE content_hash = ?',
-                (chunk['content_hash'],)
-            )
-            if cursor.fetchone() and not force:
+            if chunk['content_hash'] in indexed or chunk['content_hash'] in seen:
                 continue  # skip unchanged chunks
-
-            # generate embedding
-            embedding = self.model.encode(chunk['content'])
-            embedding_blob = embedding.tobytes()
-
-            # insert/update FTS5
-            cursor.execute('''
-                INSERT OR REPLACE INTO memory_fts (content, source_file, line_start, line_end, timestamp, content_hash)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                chunk['content'],
-                chunk['source_file'],
-                chunk['line_start'],
-                chunk['line_end'],
-                chunk['timestamp'],
-                chunk['content_hash']
-            ))
-
-            # insert/update embeddings
-            cursor.execute('''
-                INSERT OR REPLACE INTO memory_embeddings (content_hash, embedding, content, source_file, line_start, line_end, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            seen.add(chunk['content_hash'])
+            to_embed.append(chunk)
+
+        # generate all embeddings in one batched call; sentence-transformers
+        # sorts by length internally to keep padding low, and normalizing
+        # makes cosine similarity a dot product
+        embeddings = []
+        if to_embed:
+            embeddings = self.model.encode(
+                [chunk['content'] for chunk in to_embed],
+                batch_size=64,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            ).astype(np.float32)
+
+        embedding_rows = []
+        for chunk, embedding in zip(to_embed, embeddings):
+            embedding_blob, scale = _quantize(embedding)
+            embedding_rows.append((
                 chunk['content_hash'],
                 embedding_blob,
                 chunk['content'],
                 chunk['source_file'],
                 chunk['line_start'],
                 chunk['line_end'],
-                chunk['timestamp']
+                chunk['timestamp'],
+                scale
             ))
 
-            indexed_count += 1
-
-        # update file metadata
-        cursor.execute('''
-            INSERT OR REPLACE INTO file_metadata (file_path, file_hash, last_indexed)
-            VALUES (?, ?, datetime('now'))
-        ''', (str(memory_path), current_hash))
+        # insert all rows in one transaction; the triggers index them for FTS5,
+        # and re-indexed chunks are updated in place so their FTS entry follows
+        cursor.executemany('''
+            INSERT INTO memory_embeddings (content_hash, embedding, content, source_file, line_start, line_end, timestamp, scale)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (content_hash) DO UPDATE SET
+                embedding = excluded.embedding,
+                content = excluded.content,
+                source_file = excluded.source_file,
+                line_start = excluded.line_start,
+                line_end = excluded.line_end,
+                timestamp = excluded.timestamp,
+                scale = excluded.scale
+        ''', embedding_rows)
+        indexed_count = len(embedding_rows)
 
         conn.commit()
-        conn.close()
+        self._indexed_hashes.update(seen)
+
+        # refresh the embedding mirror so the next search sees the new chunks;
+        # drop the cached memmaps first, mapped files can't be replaced on Windows
+        if indexed_count:
+            self._vectors = self._vector_ids = None
+            self._vectors, self._vector_ids = self._write_vector_mirror()
+
+        # update file metadata
+        self._update_file_metadata(str(memory_path), current_hash, stat)
 
         print(f'[Stasis] Indexed {indexed_count} chunks from MEMORY.md')
 
@@ -187,24 +439,33 @@ class MemorySearch:
         Returns:
             List of search results ranked by relevance
         """
-        # generate query embedding
-        query_embedding = self.model.encode(query)
+        # generate query embedding, normalized to match the stored vectors
+        query_embedding = np.frombuffer(_encode_query(_MODEL_NAME, query), dtype=np.float32)
 
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn
         cursor = conn.cursor()
 
         # sanitize query for FTS5 (escape special characters)
         fts_query = self._sanitize_fts_query(query)
 
-        # BM25 search via FTS5
+        # BM25 search via FTS5 - rank is the built-in bm25 score, picking the
+        # top rows by rowid first means columns are only read for those rows
+        # (FTS5 rowids are memory_embeddings ids, which holds the content)
         cursor.execute('''
-            SELECT content, source_file, line_start, line_end, timestamp, bm25(memory_fts) as bm25_score
-            FROM memory_fts
-            WHERE memory_fts MATCH ?
-            ORDER BY bm25_score
-            LIMIT ?
+            WITH matches AS (
+                SELECT rowid, rank
+                FROM memory_fts
+                WHERE memory_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            )
+            SELECT e.content, e.source_file, e.line_start, e.line_end, e.timestamp, matches.rank, e.id
+            FROM matches
+            JOIN memory_embeddings e ON e.id = matches.rowid
+            ORDER BY matches.rank
         ''', (fts_query, top_k * 2))  # get more for hybrid ranking
 
+        bm25_rows = cursor.fetchall()
         bm25_results = {
             row[0]: {
                 'content': row[0],
@@ -212,61 +473,77 @@ class MemorySearch:
                 'line_start': row[2],
                 'line_end': row[3],
                 'timestamp': row[4],
-                'bm25_score': abs(row[5])  # FTS5 returns negative scores
+                'bm25_score': -row[5]  # FTS5 rank is negative, lower is better
             }
-            for row in cursor.fetchall()
+            for row in bm25_rows
         }
 
-        # vector search
-        cursor.execute('SELECT content_hash, embedding, content, source_file, line_start, line_end, timestamp FROM memory_embeddings')
-
+        # vector search - cosine similarity against every chunk in one product
+        vectors, vector_ids = self._load_vectors()
         vector_results = {}
-        for row in cursor.fetchall():
-            content_hash, embedding_blob, content, source_file, line_start, line_end, timestamp = row
-            embedding = np.frombuffer(embedding_blob, dtype=np.float32)
-
-            # cosine similarity
-            similarity = np.dot(query_embedding, embedding) / (
-                np.linalg.norm(query_embedding) * np.linalg.norm(embedding)
-            )
-
-            vector_results[content] = {
-                'content': content,
-                'source_file': source_file,
-                'line_start': line_start,
-                'line_end': line_end,
-                'timestamp': timestamp,
-                'vector_score': float(similarity)
-            }
-
-        conn.close()
-
-        # hybrid ranking: 0.7 vector + 0.3 BM25
-        combined = {}
-        all_contents = set(bm25_results.keys()) | set(vector_results.keys())
-
-        for content in all_contents:
-            bm25_score = bm25_results.get(content, {}).get('bm25_score', 0)
-            vector_score = vector_results.get(content, {}).get('vector_score', 0)
-
-            # normalize BM25 scores (simple min-max)
-            if bm25_results:
-                max_bm25 = max(r['bm25_score'] for r in bm25_results.values())
-                bm25_score = bm25_score / max_bm25 if max_bm25 > 0 else 0
-
-            hybrid_score = 0.7 * vector_score + 0.3 * bm25_score
-
-            # use data from whichever source has it
-            data = bm25_results.get(content) or vector_results.get(content)
-            combined[content] = {**data, 'hybrid_score': hybrid_score}
-
-        # sort by hybrid score
-        ranked = sorted(combined.values(), key=lambda x: x['hybrid_score'], reverse=True)
-
-        # filter by minimum score threshold (0.3) and limit to top_k
+        if len(vector_ids):
+            similarities = vectors @ query_embedding
+
+            # chunks outside the best vector matches can only rank via BM25,
+            # so only those plus the BM25 hits need their metadata fetched
+            candidate_ids = vector_ids[list(_top_indices(similarities, top_k * 2))].tolist()
+            candidate_ids += [row[6] for row in bm25_rows]
+            cursor.execute(f'''
+                SELECT id, content, source_file, line_start, line_end, timestamp
+                FROM memory_embeddings
+                WHERE id IN ({_placeholders(candidate_ids)})
+            ''', candidate_ids)
+
+            for row_id, content, source_file, line_start, line_end, timestamp in cursor.fetchall():
+                # row ids are sorted, so the matrix row is a binary search away
+                i = int(np.searchsorted(vector_ids, row_id))
+                if i == len(vector_ids) or vector_ids[i] != row_id:
+                    continue  # added after the matrix was built
+
+                vector_results[content] = {
+                    'content': content,
+                    'source_file': source_file,
+                    'line_start': line_start,
+                    'line_end': line_end,
+                    'timestamp': timestamp,
+                    'vector_score': float(similarities[i])
+                }
+
+        # hybrid ranking: 0.7 vector + 0.3 BM25, scored for all candidates at once
+        contents = list(bm25_results.keys() | vector_results.keys())
+        bm25_scores = np.array(
+            [bm25_results[c]['bm25_score'] if c in bm25_results else 0.0 for c in contents],
+            dtype=np.float64
+        )
+        vector_scores = np.array(
+            [vector_results[c]['vector_score'] if c in vector_results else 0.0 for c in contents],
+            dtype=np.float64
+        )
+
+        # normalize BM25 scores (simple min-max)
+        max_bm25 = bm25_scores.max() if len(contents) else 0.0
+        if max_bm25 > 0:
+            bm25_scores /= max_bm25
+        else:
+            bm25_scores[:] = 0.0
+
+        hybrid_scores = 0.7 * vector_scores + 0.3 * bm25_scores
+
+        # select the top_k by hybrid score, then sort just those
+        top = list(_top_indices(hybrid_scores, top_k))
+        top.sort(key=lambda i: hybrid_scores[i], reverse=True)
+
+        # filter by minimum score threshold (0.3)
         # this prevents returning irrelevant results
         min_score = 0.3
-        filtered = [r for r in ranked if r['hybrid_score'] >= min_score][:top_k]
+        filtered = []
+        for i in top:
+            if hybrid_scores[i] < min_score:
+                break
+
+            # use data from whichever source has it
+            data = bm25_results.get(contents[i]) or vector_results[contents[i]]
+            filtered.append({**data, 'hybrid_score': float(hybrid_scores[i])})
 
         return [
             SearchResult(
@@ -280,10 +557,87 @@ class MemorySearch:
             for r in filtered
         ]
 
+    def _load_vectors(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the normalized (N, D) embedding matrix and its sorted row ids.
+
+        Memory-maps the .npy mirror when it matches the database, otherwise
+        rebuilds it from SQLite. Cached until index_memory_file adds chunks.
+
+        Returns:
+            Tuple of (matrix, row ids)
+        """
+        if self._vectors is not None:
+            return self._vectors, self._vector_ids
+
+        # the mirror is only a cache, a missing or damaged file means a rebuild
+        vectors = vector_ids = None
+        try:
+            vectors = np.load(self.vectors_path, mmap_mode='r')
+            vector_ids = np.load(self.vector_ids_path, mmap_mode='r')
+        except (OSError, ValueError, EOFError):
+            pass
+
+        if vectors is None or vector_ids is None or not self._mirror_is_current(vectors, vector_ids):
+            # unmap the stale mirror first, mapped files can't be replaced on Windows
+            vectors = vector_ids = None
+            vectors, vector_ids = self._write_vector_mirror()
+
+        self._vectors, self._vector_ids = vectors, vector_ids
+        return vectors, vector_ids
+
+    def _mirror_is_current(self, vectors: np.ndarray, vector_ids: np.ndarray) -> bool:
+        """Check the .npy mirror holds the same rows as the embeddings table."""
+        conn = self._conn
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT COUNT(*), MAX(id) FROM memory_embeddings')
+        count, max_id = cursor.fetchone()
+
+        if len(vectors) != len(vector_ids) or len(vector_ids) != count:
+            return False
+        return count == 0 or int(vector_ids[-1]) == max_id
+
+    def _write_vector_mirror(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rebuild the embedding matrix from SQLite and save it as .npy files.
+
+        Returns:
+            Tuple of (matrix, row ids)
+        """
+        conn = self._conn
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT id, embedding, scale FROM memory_embeddings ORDER BY id')
+        rows = cursor.fetchall()
+
+        # dequantize once here so each query is a plain float32 product
+        vector_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        if rows:
+            # one concatenated buffer instead of an ndarray per row
+            dim = len(rows[0][1])
+            vectors = np.frombuffer(b''.join(row[1] for row in rows), dtype=np.int8).reshape(len(rows), dim)
+            scales = np.array([row[2] for row in rows], dtype=np.float32)
+            vectors = vectors.astype(np.float32) * scales[:, None]
+
+            # rounding to int8 leaves rows slightly off unit length, renormalize
+            # so the dot product with a normalized query is exactly the cosine
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1), 1e-12)[:, None]
+        else:
+            vectors = np.empty((0, 0), dtype=np.float32)
+
+        _save_npy(self.vectors_path, vectors)
+        _save_npy(self.vector_ids_path, vector_ids)
+
+        return vectors, vector_ids
+
     def _chunk_content(self, content: str, source_file: str) -> List[dict]:
         """
         Chunk content into overlapping segments.
 
+        Chunk boundaries are found with binary searches over a prefix sum of
+        line lengths instead of accumulating (and re-walking) lines one by one.
+
         Args:
             content: Text content to chunk
             source_file: Source file path
@@ -296,79 +650,81 @@ class MemorySearch:
         chunks = []
 
         lines = content.split('\n')
-        current_chunk = []
-        current_length = 0
-        line_start = 0
-        current_timestamp = ''
+        num_lines = len(lines)
 
-        for i, line in enumerate(lines):
-            # extract timestamp if present
-            if line.startswith('[') and ']' in line:
-                current_timestamp = line.split(']')[0][1:]
+        # offsets[j] is the char offset where line j starts (+1 per newline),
+        # so lines s..e span offsets[e + 1] - offsets[s] chars
+        offsets = np.zeros(num_lines + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, lines), dtype=np.int64, count=num_lines) + 1, out=offsets[1:])
 
-            current_chunk.append(line)
-            current_length += len(line) + 1  # +1 for newline
-
-            if current_length >= chunk_size:
-                chunk_text = '\n'.join(current_chunk)
-                chunk_hash = hashlib.md5(chunk_text.encode()).hexdigest()
-
-                chunks.append({
-                    'content': chunk_text,
-                    'source_file': source_file,
-                    'line_start': line_start,
-                    'line_end': i,
-                    'timestamp': current_timestamp,
-                    'content_hash': chunk_hash
-                })
-
-                # keep overlap for next chunk
-                overlap_lines = []
-                overlap_length = 0
-                for line in reversed(current_chunk):
-                    overlap_length += len(line) + 1
-                    overlap_lines.insert(0, line)
-                    if overlap_length >= overlap:
-                        break
-
-                current_chunk = overlap_lines
-                current_length = overlap_length
-                line_start = i - len(overlap_lines) + 1
-
-        # add remaining content as final chunk
-        if current_chunk:
-            chunk_text = '\n'.join(current_chunk)
-            chunk_hash = hashlib.md5(chunk_text.encode()).hexdigest()
+        # lines starting with "[...]" carry the timestamp for the lines after them
+        ts_lines = [i for i, line in enumerate(lines) if line.startswith('[') and ']' in line]
 
+        def add_chunk(start: int, end: int) -> None:
+            chunk_text = '\n'.join(lines[start:end + 1])
+            ts_index = bisect.bisect_right(ts_lines, end) - 1
+            timestamp = lines[ts_lines[ts_index]].split(']')[0][1:] if ts_index >= 0 else ''
             chunks.append({
                 'content': chunk_text,
                 'source_file': source_file,
-                'line_start': line_start,
-                'line_end': len(lines) - 1,
-                'timestamp': current_timestamp,
-                'content_hash': chunk_hash
+                'line_start': start,
+                'line_end': end,
+                'timestamp': timestamp,
+                'content_hash': _hash_bytes(chunk_text.encode())
             })
 
+        # for every line, the line at which a chunk starting there reaches
+        # chunk_size, and the first line of the overlap kept when a chunk ends there
+        chunk_ends = (np.searchsorted(offsets, offsets[:-1] + chunk_size) - 1).tolist()
+        overlap_starts = (np.searchsorted(offsets, offsets[1:] - overlap, side='right') - 1).tolist()
+
+        line_start = 0
+        min_end = 0
+        while line_start < num_lines:
+            # always add at least one line past the previous chunk
+            end = max(chunk_ends[line_start], min_end)
+            if end >= num_lines:
+                break
+
+            add_chunk(line_start, end)
+
+            # keep overlap for next chunk - the last lines adding up to overlap chars
+            line_start = max(overlap_starts[end], line_start)
+            min_end = end + 1
+
+        # add remaining content as final chunk
+        add_chunk(line_start, num_lines - 1)
+
         return chunks
 
     def _hash_file(self, file_path: Path) -> str:
-        """Calculate MD5 hash of file."""
-        return hashlib.md5(file_path.read_bytes()).hexdigest()
+        """Calculate BLAKE2b hash of file."""
+        return _hash_bytes(file_path.read_bytes())
 
-    def _file_changed(self, file_path: str, current_hash: str) -> bool:
-        """Check if file has changed since last index."""
-        conn = sqlite3.connect(self.db_path)
+    def _get_file_metadata(self, file_path: str) -> Optional[Tuple[str, int, int]]:
+        """Get the (hash, mtime_ns, size) recorded when a file was last indexed."""
+        conn = self._conn
         cursor = conn.cursor()
 
-        cursor.execute('SELECT file_hash FROM file_metadata WHERE file_path = ?', (file_path,))
+        cursor.execute(
+            'SELECT file_hash, file_mtime_ns, file_size FROM file_metadata WHERE file_path = ?',
+            (file_path,)
+        )
         row = cursor.fetchone()
 
-        conn.close()
+        return row  # None if never indexed
 
-        if not row:
-            return True  # never indexed
+    def _update_file_metadata(self, file_path: str, file_hash: str, stat: os.stat_result) -> None:
+        """Record the hash, mtime and size of a file after indexing."""
+        conn = self._conn
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            INSERT OR REPLACE INTO file_metadata (file_path, file_hash, last_indexed, file_mtime_ns, file_size)
+            VALUES (?, ?, datetime('now'), ?, ?)
+        ''', (file_path, file_hash, stat.st_mtime_ns, stat.st_size))
 
-        return row[0] != current_hash
+        conn.commit()
 
     def _sanitize_fts_query(self, query: str) -> str:
         """
@@ -5,14 +5,14 @@ Defines supported models across different providers with their
 context windows, token limits, and feature support.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Literal
 
 
 ProviderType = Literal['anthropic', 'openai', 'ollama']
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ModelConfig:
     """Configuration for a specific model."""
     name: str
@@ -118,6 +118,32 @@ MODEL_REGISTRY = {
 }
 
 
+# defaults for models not in the registry, copied with the requested name
+DEFAULT_CONFIGS = {
+    'anthropic': ModelConfig(
+        name='',
+        provider='anthropic',
+        max_tokens=4096,
+        context_window=200000,
+        supports_tools=True,
+    ),
+    'openai': ModelConfig(
+        name='',
+        provider='openai',
+        max_tokens=4096,
+        context_window=8192,
+        supports_tools=True,
+    ),
+    'ollama': ModelConfig(
+        name='',
+        provider='ollama',
+        max_tokens=2048,
+        context_window=4096,
+        supports_tools=False,
+    ),
+}
+
+
 def get_model_config(model_name: str, provider: ProviderType) -> ModelConfig:
     """
     Get configuration for a model by name.
@@ -125,33 +151,13 @@ def get_model_config(model_name: str, provider: ProviderType) -> ModelConfig:
     If model not in registry, returns a default config for that provider.
     This allows using custom/new models without updating the registry.
     """
-    if model_name in MODEL_REGISTRY:
-        return MODEL_REGISTRY[model_name]
+    config = MODEL_REGISTRY.get(model_name)
+    if config is not None:
+        return config
 
     # default configs for unknown models
     print(f'[Stasis] Warning: model {model_name} not in registry, using defaults')
 
-    if provider == 'anthropic':
-        return ModelConfig(
-            name=model_name,
-            provider='anthropic',
-            max_tokens=4096,
-            context_window=200000,
-            supports_tools=True,
-        )
-    elif provider == 'openai':
-        return ModelConfig(
-            name=model_name,
-            provider='openai',
-            max_tokens=4096,
-            context_window=8192,
-            supports_tools=True,
-        )
-    else:  # ollama
-        return ModelConfig(
-            name=model_name,
-            provider='ollama',
-            max_tokens=2048,
-            context_window=4096,
-            supports_tools=False,
-        )
+    # anything that isn't anthropic or openai is treated as ollama
+    default = DEFAULT_CONFIGS.get(provider, DEFAULT_CONFIGS['ollama'])
+    return replace(default, name=model_name)
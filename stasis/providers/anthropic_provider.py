@@ -5,6 +5,7 @@ Uses the official Anthropic Python SDK to interact with Claude models.
 As of version 0.1.0 this is the main implementation.
 """
 
+from operator import attrgetter
 from typing import List
 
 from anthropic import Anthropic
@@ -12,6 +13,10 @@ from anthropic import Anthropic
 from .base import Provider, Message
 
 
+# (role, content) of a Message in one C-level call
+_ROLE_AND_CONTENT = attrgetter('role', 'content')
+
+
 class AnthropicProvider(Provider):
     """Provider for Anthropic Claude models."""
 
@@ -48,8 +53,8 @@ class AnthropicProvider(Provider):
         """
         # convert our Message objects to Anthropic's format
         anthropic_messages = [
-            {'role': msg.role, 'content': msg.content}
-            for msg in messages
+            {'role': role, 'content': content}
+            for role, content in map(_ROLE_AND_CONTENT, messages)
         ]
 
         try:
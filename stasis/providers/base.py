@@ -9,7 +9,7 @@ from dataclasses import dataclass
 from typing import List, Dict, Any
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Message:
     """A single message in a conversation."""
     role: str  # 'user', 'assistant', or 'system'
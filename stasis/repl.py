@@ -7,7 +7,7 @@ Interactive command-line interface for chatting with your assistant.
 import sys
 from pathlib import Path
 
-from .config import settings
+from .config import get_settings
 from .core.memory import Memory
 from .core.agent import Agent
 from .providers.anthropic_provider import AnthropicProvider
@@ -15,6 +15,8 @@ from .providers.anthropic_provider import AnthropicProvider
 
 def main():
     """Run the REPL."""
+    settings = get_settings()
+
     print(f'Stasis v0.1.0')
     print(f'Provider: {settings.provider} ({settings.get_active_model()})')
     print(f'Workspace: {settings.workspace}')
@@ -22,7 +24,7 @@ def main():
 
     # initialize components
     try:
-        memory = Memory(settings.workspace)
+        memory = Memory(settings.workspace, parallel_reads=settings.parallel_reads)
 
         if settings.provider == 'anthropic':
             if not settings.anthropic_api_key: